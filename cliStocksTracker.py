@@ -24,6 +24,9 @@ def merge_config(config, args):
             args.timezone = config["General"]["timezone"]
         if "rounding_mode" in config["General"]:
             args.rounding_mode = config["General"]["rounding_mode"]
+        # the config can only switch fast rendering on, --fast-render always wins
+        if "fast_render" in config["General"] and not args.fast_render:
+            args.fast_render = config["General"]["fast_render"] == "True"
 
     if "Frame" in config:
         if "width" in config["Frame"]:
@@ -52,7 +55,11 @@ def main():
 
     portfolio.populate(stocks_config, args)
     portfolio.gen_graphs(
-        args.independent_graphs, args.width, args.height, args.timezone
+        args.independent_graphs,
+        args.width,
+        args.height,
+        args.timezone,
+        args.fast_render,
     )
 
     # print to the screen
@@ -82,6 +89,12 @@ def parse_args():
         help="show a chart for each stock (default false)",
         default=False,
     )
+    parser.add_argument(
+        "--fast-render",
+        action="store_true",
+        help="draw charts with the faster built-in braille renderer (default false)",
+        default=False,
+    )
     parser.add_argument(
         "--timezone",
         type=str,
@@ -124,7 +137,7 @@ def parse_args():
 
 def verify_stock_keys(stocks_config):
     # check that at least one stock is in portfolio.ini
-    if list(stocks_config.keys()) == ["DEFAULT"]:
+    if not stocks_config.sections():
         print(
             "portfolio.ini has no stocks added or does not exist. There is nothing to show."
         )
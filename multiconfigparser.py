@@ -34,20 +34,29 @@ class ConfigParserMultiOpt(configparser.RawConfigParser):
         lineno = 0
         indent_level = 0
         e = None  # None, or an exception
+        # hoist the per-parser settings out of the loop, they are used on every line
+        inline_comment_prefixes = self._inline_comment_prefixes
+        comment_prefixes = tuple(self._comment_prefixes)
+        nonspace_re = self.NONSPACECRE
+        sect_re = self.SECTCRE
+        opt_re = self._optcre
         for lineno, line in enumerate(fp, start=1):
-            comment_start = None
-            # strip inline comments
-            for prefix in self._inline_comment_prefixes:
-                index = line.find(prefix)
-                if index == 0 or (index > 0 and line[index - 1].isspace()):
-                    comment_start = index
-                    break
+            stripped = line.strip()
             # strip full line comments
-            for prefix in self._comment_prefixes:
-                if line.strip().startswith(prefix):
-                    comment_start = 0
-                    break
-            value = line[:comment_start].strip()
+            if stripped.startswith(comment_prefixes):
+                value = ""
+                comment_start = 0
+            else:
+                comment_start = None
+                # strip inline comments
+                for prefix in inline_comment_prefixes:
+                    index = line.find(prefix)
+                    if index == 0 or (index > 0 and line[index - 1].isspace()):
+                        comment_start = index
+                        break
+                value = (
+                    stripped if comment_start is None else line[:comment_start].strip()
+                )
             if not value:
                 if self._empty_lines_in_values:
                     # add empty line to the value, but only if there was no
@@ -64,20 +73,22 @@ class ConfigParserMultiOpt(configparser.RawConfigParser):
                     indent_level = sys.maxsize
                 continue
             # continuation line?
-            first_nonspace = self.NONSPACECRE.search(line)
+            first_nonspace = nonspace_re.search(line)
             cur_indent_level = first_nonspace.start() if first_nonspace else 0
             if cursect is not None and optname and cur_indent_level > indent_level:
                 cursect[optname].append(value)
             # a section header or option header?
             else:
                 indent_level = cur_indent_level
-                # is it a section header?
-                mo = self.SECTCRE.match(value)
+                # is it a section header? only lines starting with "[" can be
+                mo = sect_re.match(value) if value[0] == "[" else None
                 if mo:
                     sectname = mo.group("header")
                     if sectname in self._sections:
                         if self._strict and sectname in elements_added:
-                            raise DuplicateSectionError(sectname, fpname, lineno)
+                            raise configparser.DuplicateSectionError(
+                                sectname, fpname, lineno
+                            )
                         cursect = self._sections[sectname]
                         elements_added.add(sectname)
                     elif sectname == self.default_section:
@@ -93,10 +104,10 @@ class ConfigParserMultiOpt(configparser.RawConfigParser):
                     optname = None
                 # no section header in the file?
                 elif cursect is None:
-                    raise MissingSectionHeaderError(fpname, lineno, line)
+                    raise configparser.MissingSectionHeaderError(fpname, lineno, line)
                 # an option line?
                 else:
-                    mo = self._optcre.match(value)
+                    mo = opt_re.match(value)
                     if mo:
                         optname, vi, optval = mo.group("option", "vi", "value")
                         if not optname:
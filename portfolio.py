@@ -1,28 +1,50 @@
+import os
 import pytz
 import utils
+import hashlib
 import plotille
 import warnings
 import webcolors
 import autocolors
 
 import numpy as np
+import pandas as pd
 import yfinance as market
 
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 
+# downloaded market data is reused by runs within the same minute
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cliStocksTracker")
+
+# automatic graph colors are converted to rgb once instead of on every graph
+_AUTO_COLORS_RGB = [webcolors.hex_to_rgb(color) for color in autocolors.color_list]
+
+
+# named colors are converted on first use and remembered after that
+@lru_cache(maxsize=None)
+def _name_to_rgb(name):
+    return webcolors.name_to_rgb(name)
+
 
 @dataclass
 class Stock:
     symbol: str
-    data: list
+    data: np.ndarray
 
     def __post_init__(self):
-        self.curr_value = self.data[-1]
-        self.open_value = self.data[0]
-        self.high = max(self.data)
-        self.low = min(self.data)
-        self.average = sum(self.data) / len(self.data)
+        # keep prices as a float64 array so the reductions below run in numpy
+        # missing minutes are NaN, the aggregates only use the real observations
+        self.data = np.asarray(self.data, dtype=np.float64)
+        observed = self.data[~np.isnan(self.data)]
+
+        # the aggregates are stored as plain floats, everything downstream is scalar math
+        self.curr_value = float(observed[-1])
+        self.open_value = float(observed[0])
+        self.high = float(observed.max())
+        self.low = float(observed.min())
+        self.average = float(observed.mean())
         self.change_amount = self.curr_value - self.open_value
         self.change_percentage = (self.change_amount / self.curr_value) * 100
         return
@@ -48,7 +70,22 @@ class PortfolioEntry:
         return
 
 
-class Portfolio(metaclass=utils.Singleton):
+# parse "count@price" orders into arrays and return (total count, total price paid)
+def _sum_orders(orders, key: str, opposite_key: str):
+    orders = [_.split("@") for _ in ([orders] if type(orders) is not tuple else orders)]
+    counts = np.array([float(order[0]) for order in orders], dtype=np.float64)
+    prices = np.array([float(order[1]) for order in orders], dtype=np.float64)
+
+    if (counts <= 0).any():
+        print(
+            f'A negative "{key}" key was detected. Use the {opposite_key} key instead to guarantee accurate calculations.'
+        )
+        exit()
+
+    return float(counts.sum()), float(counts @ prices)
+
+
+class Portfolio:
     def __init__(self, *args, **kwargs):
         self.stocks = {}
         self.open_market_value = 0  # portfolio worth at market open
@@ -81,29 +118,8 @@ class Portfolio(metaclass=utils.Singleton):
         return self.stocks[symbol]
 
     def average_buyin(self, buys: list, sells: list):
-        buy_c, buy_p, sell_c, sell_p, count, bought_at = 0, 0, 0, 0, 0, 0
-        buys = [_.split("@") for _ in ([buys] if type(buys) is not tuple else buys)]
-        sells = [_.split("@") for _ in ([sells] if type(sells) is not tuple else sells)]
-
-        for buy in buys:
-            next_c = float(buy[0])
-            if next_c <= 0:
-                print(
-                    'A negative "buy" key was detected. Use the sell key instead to guarantee accurate calculations.'
-                )
-                exit()
-            buy_c += next_c
-            buy_p += float(buy[1]) * next_c
-
-        for sell in sells:
-            next_c = float(sell[0])
-            if next_c <= 0:
-                print(
-                    'A negative "sell" key was detected. Use the buy key instead to guarantee accurate calculations.'
-                )
-                exit()
-            sell_c += next_c
-            sell_p += float(sell[1]) * next_c
+        buy_c, buy_p = _sum_orders(buys, "buy", "sell")
+        sell_c, sell_p = _sum_orders(sells, "sell", "buy")
 
         count = buy_c - sell_c
         if count == 0:
@@ -113,13 +129,41 @@ class Portfolio(metaclass=utils.Singleton):
 
         return count, bought_at
 
-    # download all ticker data in a single request
-    # harder to parse but this provides a signficant performance boost
     def download_market_data(self, args, stocks):
         # get graph time interval and period
         time_period = args.time_period if args.time_period else "1d"
         time_interval = args.time_interval if args.time_interval else "1m"
 
+        # one cache file per set of tickers, period and interval
+        key = hashlib.sha1(
+            repr((sorted(stocks), time_period, time_interval)).encode()
+        ).hexdigest()
+        cache_path = os.path.join(CACHE_DIR, key + ".pkl")
+
+        # only trust the cached data if it was written during the current minute
+        if os.path.exists(cache_path):
+            written = datetime.fromtimestamp(os.path.getmtime(cache_path))
+            if written.replace(second=0, microsecond=0) == datetime.now().replace(
+                second=0, microsecond=0
+            ):
+                try:
+                    return pd.read_pickle(cache_path)
+                except Exception:
+                    pass  # unreadable cache, just download again
+
+        market_data = self.fetch_market_data(stocks, time_period, time_interval)
+        # yfinance returns an empty frame when the download fails, never cache that
+        if market_data is not None and not market_data.empty:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                market_data.to_pickle(cache_path)
+            except OSError:
+                pass  # caching is best effort only
+        return market_data
+
+    # download all ticker data in a single request
+    # harder to parse but this provides a signficant performance boost
+    def fetch_market_data(self, stocks, time_period, time_interval):
         try:
             return market.download(
                 tickers=stocks,
@@ -139,38 +183,38 @@ class Portfolio(metaclass=utils.Singleton):
         # download all stock data
         market_data = self.download_market_data(args, sections)
 
-        # iterate through each ticker data
+        # select the open prices once, each ticker's column is read from this frame
+        # a single ticker download may not be split into tickers, give it a ticker column
         data_key = "Open"
+        opens = market_data[data_key]
+        if not isinstance(market_data.columns, pd.MultiIndex):
+            opens = opens.to_frame(sections[0])
+
+        # iterate through each ticker data
         for ticker in sections:
-            # convert the numpy array into a list of prices while removing NaN values
-            # if there is only one section, the data frame is not split into tickers
-            if len(sections) > 1:
-                data = market_data[data_key][ticker].values[
-                    ~np.isnan(market_data[data_key][ticker].values)
-                ]
-            else:
-                data = market_data[data_key].values[
-                    ~np.isnan(market_data[data_key].values)
-                ]
+            # pull the prices out as a numpy array, NaN values are kept (not dropped)
+            # so each price stays on its minute of the graph
+            data = opens[ticker].to_numpy(dtype=np.float64)
+            if np.isnan(data).all():
+                warnings.warn(
+                    "No market data was found for " + ticker + ". It will not be shown."
+                )
+                continue
             new_stock = Stock(ticker, data)
 
             # calculate average buy in
             buyin = (
-                stocks_config[ticker]["buy"]
-                if "buy" in list(stocks_config[ticker].keys())
-                else ()
+                stocks_config[ticker]["buy"] if "buy" in stocks_config[ticker] else ()
             )
             sellout = (
-                stocks_config[ticker]["sell"]
-                if "sell" in list(stocks_config[ticker].keys())
-                else ()
+                stocks_config[ticker]["sell"] if "sell" in stocks_config[ticker] else ()
             )
             count, bought_at = self.average_buyin(buyin, sellout)
 
             # Check the stock color for graphing
             color = (
                 str(stocks_config[ticker]["color"])
-                if "color" in list(stocks_config[ticker].keys())
+                if "color" in stocks_config[ticker]
                 else None
             )
 
@@ -179,10 +223,14 @@ class Portfolio(metaclass=utils.Singleton):
             if color == None:
                 colorWarningFlag = False
             elif type(color) == str:
-                if (color.startswith("#")) or (
-                    color in webcolors.CSS3_NAMES_TO_HEX.keys()
-                ):
+                if color.startswith("#"):
                     colorWarningFlag = False
+                else:
+                    try:
+                        _name_to_rgb(color)
+                        colorWarningFlag = False
+                    except ValueError:
+                        pass  # not a known color name
 
             if colorWarningFlag:
                 warnings.warn(
@@ -193,14 +241,31 @@ class Portfolio(metaclass=utils.Singleton):
                 color = None
 
             should_graph = (
-                "graph" in list(stocks_config[ticker].keys())
+                "graph" in stocks_config[ticker]
                 and stocks_config[ticker]["graph"] == "True"
             )
 
             # finally, add the stock to the portfolio
             self.add_entry(new_stock, count, bought_at, color, should_graph)
 
-    def gen_graphs(self, independent_graphs, graph_width, graph_height, cfg_timezone):
+    def gen_graphs(
+        self,
+        independent_graphs,
+        graph_width,
+        graph_height,
+        cfg_timezone,
+        fast_render=False,
+    ):
+        # every graph shares the same timezone and time range, only work them out once
+        timezone = pytz.timezone(cfg_timezone)
+        start, end = market_hours(timezone)
+        graph_kwargs = {
+            "tz": timezone,
+            "starttime": start,
+            "endtime": end,
+            "fast_render": fast_render,
+        }
+
         graphs = []
         if not independent_graphs:
             graphing_list = []
@@ -216,7 +281,7 @@ class Portfolio(metaclass=utils.Singleton):
                         graph_width,
                         graph_height,
                         color_list,
-                        timezone=cfg_timezone,
+                        **graph_kwargs,
                     )
                 )
         else:
@@ -228,16 +293,32 @@ class Portfolio(metaclass=utils.Singleton):
                             graph_width,
                             graph_height,
                             [sm.color],
-                            timezone=cfg_timezone,
+                            **graph_kwargs,
                         )
                     )
 
         for graph in graphs:
-            graph.gen_graph(autocolors.color_list)
+            graph.gen_graph(_AUTO_COLORS_RGB)
         self.graphs = graphs
         return
 
 
+# today's regular market hours (14:30 - 21:00 UTC) in the given timezone
+def market_hours(timezone):
+    now = datetime.now()
+    start = (
+        now.replace(hour=14, minute=30, second=0)
+        .replace(tzinfo=pytz.utc)
+        .astimezone(timezone)
+    )
+    end = (
+        now.replace(hour=21, minute=0, second=0)
+        .replace(tzinfo=pytz.utc)
+        .astimezone(timezone)
+    )
+    return start, end
+
+
 class Graph:
     def __init__(
         self, stocks: list, width: int, height: int, colors: list, *args, **kwargs
@@ -253,39 +334,36 @@ class Graph:
         self.plot.X_label = "Time"
         self.plot.Y_label = "Value"
 
-        if "timezone" in kwargs.keys():
+        # the timezone and time range are normally resolved once by Portfolio.gen_graphs
+        # tz takes a ready pytz timezone, timezone takes a timezone name
+        if "tz" in kwargs:
+            self.timezone = kwargs["tz"]
+        elif "timezone" in kwargs:
             self.timezone = pytz.timezone(kwargs["timezone"])
         else:
             self.timezone = pytz.utc
 
-        if "starttime" in kwargs.keys():
-            self.start = (
-                kwargs["startend"].replace(tzinfo=pytz.utc).astimezone(self.timezone)
-            )
-        else:
-            self.start = (
-                datetime.now()
-                .replace(hour=14, minute=30, second=0)
-                .replace(tzinfo=pytz.utc)
-                .astimezone(self.timezone)
-            )
-
-        if "endtime" in kwargs.keys():
-            self.end = (
-                kwargs["endtime"].replace(tzinfo=pytz.utc).astimezone(self.timezone)
-            )
-        else:
-            self.end = (
-                datetime.now()
-                .replace(hour=21, minute=0, second=0)
-                .replace(tzinfo=pytz.utc)
-                .astimezone(self.timezone)
-            )
+        # any end of the time range that is not given defaults to today's market hours
+        if "starttime" not in kwargs or "endtime" not in kwargs:
+            self.start, self.end = market_hours(self.timezone)
+        if "starttime" in kwargs:
+            self.start = self.in_timezone(kwargs["starttime"])
+        if "endtime" in kwargs:
+            self.end = self.in_timezone(kwargs["endtime"])
 
         self.plot.set_x_limits(min_=self.start, max_=self.end)
 
+        # draw with the numpy braille rasterizer instead of plotille
+        self.fast_render = kwargs.get("fast_render", False)
+
         return
 
+    # convert a given time into the graph's timezone, naive times are taken to be utc
+    def in_timezone(self, time):
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=pytz.utc)
+        return time.astimezone(self.timezone)
+
     def __call__(self):
         return self.graph
 
@@ -297,19 +375,31 @@ class Graph:
         self.y_min, self.y_max = self.find_y_range()
         self.plot.set_y_limits(min_=self.y_min, max_=self.y_max)
 
+        colors = []
         for i, stock in enumerate(self.stocks):
             if self.colors[i] == None:
-                color = webcolors.hex_to_rgb(auto_colors[i % 67])
+                colors.append(auto_colors[i % len(auto_colors)])
             elif self.colors[i].startswith("#"):
-                color = webcolors.hex_to_rgb(self.colors[i])
+                colors.append(webcolors.hex_to_rgb(self.colors[i]))
             else:
-                color = webcolors.hex_to_rgb(
-                    webcolors.CSS3_NAMES_TO_HEX[self.colors[i]]
-                )
+                colors.append(_name_to_rgb(self.colors[i]))
+
+        # fill in missing prices for drawing only, the table uses the real observations
+        series = [utils.fill_nan(stock.data) for stock in self.stocks]
 
+        if self.fast_render:
+            self.graph = self.gen_braille_graph(series, colors)
+            return
+
+        # build the time axis once for the longest series, each curve uses a prefix of it
+        # these stay tz-aware datetimes so plotille can compare them with the x limits
+        length = max(len(data) for data in series)
+        times = [self.start + timedelta(minutes=m) for m in range(length)]
+
+        for stock, data, color in zip(self.stocks, series, colors):
             self.plot.plot(
-                [self.start + timedelta(minutes=i) for i in range(len(stock.data))],
-                stock.data,
+                times[: len(data)],
+                data,
                 lc=color,
                 label=stock.symbol,
             )
@@ -317,14 +407,104 @@ class Graph:
         self.graph = self.plot.show(legend=True)
         return
 
-    def find_y_range(self):
-        y_min = 10000000000000  # Arbitrarily large number (bigger than any single stock should ever be worth)
-        y_max = 0
+    # draw the graph with render_braille instead of plotille, plus value and time axes
+    def gen_braille_graph(self, series, colors):
+        width, height = self.plot.width, self.plot.height
+        minutes = (self.end - self.start).total_seconds() / 60
+        rows = render_braille(
+            series,
+            colors,
+            width,
+            height,
+            self.y_min,
+            self.y_max,
+            x_span=minutes,
+        )
+
+        # label each row with the value at its top edge
+        step = (self.y_max - self.y_min) / height
+        lines = [
+            "{:>12.2f} | ".format(self.y_max - row * step) + line
+            for row, line in enumerate(rows)
+        ]
+        lines.append(" " * 13 + "+" + "-" * (width + 1))
+        lines.append(
+            " " * 15
+            + self.start.strftime("%H:%M")
+            + self.end.strftime("%H:%M").rjust(width - 5)
+        )
 
-        for stock in self.stocks:
-            if y_min > min(stock.data):
-                y_min = min(stock.data)
-            if y_max < max(stock.data):
-                y_max = max(stock.data)
+        # legend
+        lines.append("")
+        for stock, color in zip(self.stocks, colors):
+            lines.append(
+                " " * 15 + _rgb_escape(color) + "\u28e4\u28e4 " + _RESET + stock.symbol
+            )
+
+        return "\n".join(lines)
+
+    def find_y_range(self):
+        # each stock already knows its own low and high, no need to rescan the data
+        y_min = min(stock.low for stock in self.stocks)
+        y_max = max(stock.high for stock in self.stocks)
 
         return y_min, y_max
+
+
+# braille dot bit for every (row, column) position inside a 4x2 character cell
+_BRAILLE_DOTS = np.array(
+    [[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype=np.uint8
+)
+_RESET = "\x1b[0m"
+
+
+def _rgb_escape(color):
+    return "\x1b[38;2;{};{};{}m".format(*color)
+
+
+# rasterize price series into rows of colored braille characters, one numpy pass per series
+# every character holds 2x4 dots, point i of a series lands at i / x_span of the canvas width
+# when several series share a character, the last one drawn picks its color
+def render_braille(series_list, colors, width, height, y_min, y_max, x_span=None):
+    if x_span is None:
+        x_span = max(len(series) for series in series_list)
+    x_span = max(x_span, 1)
+    y_span = (y_max - y_min) or 1.0
+    dot_width, dot_height = width * 2, height * 4
+
+    dots = np.zeros((height, width), dtype=np.uint8)
+    owner = np.full((height, width), -1, dtype=np.int64)
+    for i, series in enumerate(series_list):
+        series = np.asarray(series, dtype=np.float64)
+        valid = ~np.isnan(series)
+
+        xs = (np.arange(series.size) * dot_width / x_span).astype(np.int64)[valid]
+        ys = np.rint((series[valid] - y_min) / y_span * (dot_height - 1))
+        ys = ys.astype(np.int64)
+
+        inside = (xs >= 0) & (xs < dot_width) & (ys >= 0) & (ys < dot_height)
+        # flip y so that the highest values end up on the first row
+        xs, ys = xs[inside], dot_height - 1 - ys[inside]
+
+        rows, cols = ys // 4, xs // 2
+        np.bitwise_or.at(dots, (rows, cols), _BRAILLE_DOTS[ys % 4, xs % 2])
+        owner[rows, cols] = i
+
+    escapes = [_rgb_escape(color) for color in colors]
+    lines = []
+    for row in range(height):
+        line = []
+        current = -1
+        for col in range(width):
+            if dots[row, col] == 0:
+                line.append(" ")
+                continue
+            if owner[row, col] != current:
+                current = owner[row, col]
+                line.append(escapes[current])
+            line.append(chr(0x2800 + int(dots[row, col])))
+        if current != -1:
+            line.append(_RESET)
+        lines.append("".join(line))
+
+    return lines
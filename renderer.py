@@ -1,8 +1,10 @@
 import io
+import sys
 import utils
 import portfolio
 
 from colorama import Fore, Style, Back
+from math import isnan
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List, Callable
@@ -27,8 +29,19 @@ class ColumnFormatter:
         return cell_data.value
 
 
-def format_number(value) -> str:
-    return str(abs(utils.round_value(value, "math", 2)))
+def format_number(value, mode: str = "math") -> str:
+    # NaN shows as zero, the same as utils.round_value gives for it
+    if isnan(value):
+        return "0.00"
+    # the format call rounds to nearest, so only truncation needs round_value
+    if mode == "down":
+        value = utils.round_value(value, mode, 2)
+    return "{:.2f}".format(abs(value))
+
+
+def format_shares(count: float) -> str:
+    # share counts can be fractional but are not prices, keep them unpadded
+    return str(abs(utils.round_value(count, "math", 2)))
 
 
 def format_gl(value: float, is_currency: bool = True) -> str:
@@ -71,7 +84,7 @@ _stock_column_formatters = {
 
 _portfolio_column_formatters = {
     "Stocks Owned": ColumnFormatter(
-        "Owned", 9, lambda entry: CellData(format_number(entry.count))
+        "Owned", 9, lambda entry: CellData(format_shares(entry.count))
     ),
     "Gains per Share": ColumnFormatter(
         "G/L/S",
@@ -107,82 +120,95 @@ class Renderer(metaclass=utils.Singleton):
         return
 
     def render(self):
-        print()
+        # collect everything into one buffer and hand it to the terminal in a single write
+        out = ["\n"]
         for graph in self.portfolio.graphs:
-            graph.draw()
+            out.append(graph() + "\n")
+
+        self.print_new_table(out)
+        out.append("\n")
 
-        self.print_new_table()
-        print()
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
         return
 
-    def print_gains(self, format_str, gain, timespan):
+    def print_gains(self, out, format_str, gain, timespan):
         positive_gain = gain >= 0
         gain_symbol = "+" if positive_gain else "-"
         gain_verboge = "Gained" if positive_gain else "Lost"
 
-        print("{:25}".format("Value " + gain_verboge + " " + timespan + ": "), end="")
-        print(Fore.GREEN if positive_gain else Fore.RED, end="")
+        out.append("{:25}".format("Value " + gain_verboge + " " + timespan + ": "))
+        out.append(Fore.GREEN if positive_gain else Fore.RED)
 
         # This prevents a runtime warning by making sure we are never dividing by zero
         if self.portfolio.cost_value == 0:
             gain_val = 0
         else:
             gain_val = gain / self.portfolio.cost_value * 100
-        print(
-            format_str.format(
-                gain_symbol + "$" + str(abs(utils.round_value(gain, self.mode, 2)))
-            )
-            + format_str.format(
-                gain_symbol + str(abs(utils.round_value(gain_val, self.mode, 2))) + "%"
-            )
+        out.append(
+            format_str.format(gain_symbol + "$" + format_number(gain, self.mode))
+            + format_str.format(gain_symbol + format_number(gain_val, self.mode) + "%")
+            + "\n"
         )
-        print(Style.RESET_ALL, end="")
+        out.append(Style.RESET_ALL)
         return
 
-    def print_overall_summary(self):
-        print(
+    def print_overall_summary(self, out):
+        out.append(
             "\n"
             + "{:25}".format("Current Time: ")
             + "{:13}".format(datetime.now().strftime("%A %b %d, %Y - %I:%M:%S %p"))
+            + "\n"
         )
-        print(
+        out.append(
             "{:25}".format("Total Cost: ")
             + "{:13}".format("$" + format_number(self.portfolio.cost_value))
+            + "\n"
         )
-        print(
+        out.append(
             "{:25}".format("Total Value: ")
             + "{:13}".format("$" + format_number(self.portfolio.market_value))
+            + "\n"
         )
 
         # print daily value
         value_gained_day = (
             self.portfolio.market_value - self.portfolio.open_market_value
         )
-        self.print_gains("{:13}", value_gained_day, "Today")
+        self.print_gains(out, "{:13}", value_gained_day, "Today")
 
         # print overall value
         value_gained_all = self.portfolio.market_value - self.portfolio.cost_value
-        self.print_gains("{:13}", value_gained_all, "Overall")
+        self.print_gains(out, "{:13}", value_gained_all, "Overall")
         return
 
     def print_new_table(
         self,
+        out,
         stock_cols=list(_stock_column_formatters.keys()),
         portfolio_cols=list(_portfolio_column_formatters.keys()),
     ):
         # print heading
-        print("\nPortfolio Summary:\n")
+        out.append("\nPortfolio Summary:\n\n")
+
+        # resolve every column once: (formatter, cell format string, is stock column)
+        columns = []
+        for col in stock_cols + portfolio_cols:
+            col_formatter = _stock_column_formatters.get(col)
+            is_stock = col_formatter != None
+            if not is_stock:
+                col_formatter = _portfolio_column_formatters.get(col)
+            columns.append(
+                (col_formatter, "{:" + str(col_formatter.width) + "}", is_stock)
+            )
 
         # print the heading
         heading = "\t"
         divider = "\t"
-        for col in stock_cols + portfolio_cols:
-            column = _stock_column_formatters.get(
-                col
-            ) or _portfolio_column_formatters.get(col)
-            heading += ("{:" + str(column.width) + "}").format(column.header)
+        for column, cell_format, _ in columns:
+            heading += cell_format.format(column.header)
             divider += "-" * column.width
-        print(heading + "\n" + divider)
+        out.append(heading + "\n" + divider + "\n")
 
         # now print every portfolio entry
         for i, entry in enumerate(self.portfolio.stocks.values()):
@@ -192,23 +218,15 @@ class Renderer(metaclass=utils.Singleton):
             highlight_color = Back.LIGHTBLACK_EX if i % 2 == 0 else Back.RESET
             line += highlight_color
 
-            for i, col in enumerate(stock_cols + portfolio_cols):
-                col_formatter = _stock_column_formatters.get(col)
-
-                is_stock = col_formatter != None
-                if not is_stock:
-                    col_formatter = _portfolio_column_formatters.get(col)
-
+            for col_formatter, cell_format, is_stock in columns:
                 cell_data = col_formatter.generator(stock if is_stock else entry)
-                line += cell_data.color + (
-                    "{:" + str(col_formatter.width) + "}"
-                ).format(cell_data.value)
+                line += cell_data.color + cell_format.format(cell_data.value)
 
             # print the entry
-            line += Style.RESET_ALL
-            print(line)
+            line += Style.RESET_ALL + "\n"
+            out.append(line)
 
         # TODO: print totals line
 
-        self.print_overall_summary()
+        self.print_overall_summary(out)
         return
@@ -6,6 +6,15 @@ from pandas import DataFrame
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import portfolio
 import autocolors
+from datetime import datetime, timedelta
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # keep the tests out of the real market data cache
+    monkeypatch.setattr(portfolio, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
 
 class BlankArgs:
     time_period = None
@@ -51,6 +60,25 @@ class TestStockDataclass:
         return self.my_stock.change_percentage == 100
 
 
+class TestStockMissingData:
+
+    nan = float("NaN")
+    my_stock = portfolio.Stock("TEST", [nan, 1, nan, nan, 4, nan])
+
+    def test_curr_value(self):
+        assert self.my_stock.curr_value == 4
+
+    def test_open_value(self):
+        assert self.my_stock.open_value == 1
+
+    def test_average(self):
+        # only the real observations count, missing minutes are not filled in
+        assert self.my_stock.average == 2.5
+
+    def test_data_keeps_minutes(self):
+        assert len(self.my_stock.data) == 6
+
+
 class TestPortfolioEntryDataclass:
 
     my_stock = portfolio.Stock("TEST", [2, 1, 3, 5, 4])
@@ -212,3 +240,200 @@ class TestPortfolio:
             )
         assert not errors, "errors occured:\n{}".format("\n".join(errors))
 
+    def test_populate_skips_missing_tickers(self, monkeypatch):
+        nan = float("NaN")
+        market_data = DataFrame(
+            {("Open", "AAPL"): [1.0, nan, 3.0], ("Open", "GONE"): [nan, nan, nan]}
+        )
+        monkeypatch.setattr(
+            self.my_portfolio,
+            "download_market_data",
+            lambda args, stocks: market_data,
+        )
+        test_stocks_config = BlankStocksConfig()
+        test_stocks_config.tickers = {"AAPL": {"graph": "True"}, "GONE": {}}
+
+        self.my_portfolio.stocks = {}
+        with pytest.warns(UserWarning):
+            self.my_portfolio.populate(test_stocks_config, BlankArgs())
+
+        assert list(self.my_portfolio.stocks.keys()) == ["AAPL"]
+        assert self.my_portfolio.get_stock("AAPL").stock.average == 2
+
+        # the graph fills the gap instead of failing on the NaN
+        self.my_portfolio.gen_graphs(False, 30, 10, "America/New_York")
+        assert len(self.my_portfolio.graphs) == 1
+
+    def test_populate_color_names(self, monkeypatch):
+        market_data = DataFrame(
+            {("Open", "AAPL"): [1.0, 2.0], ("Open", "TSLA"): [3.0, 4.0]}
+        )
+        monkeypatch.setattr(
+            self.my_portfolio,
+            "download_market_data",
+            lambda args, stocks: market_data,
+        )
+        test_stocks_config = BlankStocksConfig()
+        test_stocks_config.tickers = {
+            "AAPL": {"graph": "True", "color": "red"},
+            "TSLA": {"graph": "True", "color": "notacolor"},
+        }
+
+        self.my_portfolio.stocks = {}
+        with pytest.warns(UserWarning):
+            self.my_portfolio.populate(test_stocks_config, BlankArgs())
+
+        # known names are kept, unknown ones fall back to automatic colors
+        assert self.my_portfolio.get_stock("AAPL").color == "red"
+        assert self.my_portfolio.get_stock("TSLA").color == None
+
+        self.my_portfolio.gen_graphs(False, 30, 10, "America/New_York")
+        assert len(self.my_portfolio.graphs) == 1
+
+
+class TestGraphTimes:
+
+    my_stock = portfolio.Stock("TEST", [2, 1, 3, 5, 4])
+
+    def test_timezone_name(self):
+        graph = portfolio.Graph(
+            [self.my_stock], 30, 10, [None], timezone="America/New_York"
+        )
+        assert graph.timezone.zone == "America/New_York"
+        assert graph.start.tzinfo.zone == "America/New_York"
+
+    def test_tz_object(self):
+        tz = portfolio.pytz.timezone("Asia/Shanghai")
+        graph = portfolio.Graph([self.my_stock], 30, 10, [None], tz=tz)
+        assert graph.timezone is tz
+
+    def test_naive_times_are_utc(self):
+        graph = portfolio.Graph(
+            [self.my_stock],
+            30,
+            10,
+            [None],
+            timezone="America/New_York",
+            starttime=datetime(2021, 3, 1, 14, 30),
+            endtime=datetime(2021, 3, 1, 21, 0),
+        )
+        assert graph.start.strftime("%H:%M %Z") == "09:30 EST"
+        assert graph.end.strftime("%H:%M %Z") == "16:00 EST"
+
+    def test_endtime_alone(self):
+        end = datetime.now().replace(hour=20, minute=0, second=0)
+        graph = portfolio.Graph([self.my_stock], 30, 10, [None], endtime=end)
+        assert graph.end.strftime("%H:%M") == "20:00"
+        assert graph.start.strftime("%H:%M") == "14:30"
+
+    def test_starttime_alone(self):
+        start = datetime.now().replace(hour=15, minute=0, second=0)
+        graph = portfolio.Graph([self.my_stock], 30, 10, [None], starttime=start)
+        assert graph.start.strftime("%H:%M") == "15:00"
+        assert graph.end.strftime("%H:%M") == "21:00"
+
+
+class TestMarketDataCache:
+
+    my_portfolio = portfolio.Portfolio()
+    now = datetime(2021, 3, 1, 15, 30, 20)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls):
+            return TestMarketDataCache.now
+
+    def setup_fetch(self, monkeypatch, market_data):
+        calls = []
+
+        def fetch(stocks, time_period, time_interval):
+            calls.append(stocks)
+            return market_data
+
+        monkeypatch.setattr(portfolio, "datetime", self.FrozenDatetime)
+        monkeypatch.setattr(self.my_portfolio, "fetch_market_data", fetch)
+        return calls
+
+    def set_written(self, cache_dir, written):
+        for path in cache_dir.iterdir():
+            os.utime(path, (written.timestamp(), written.timestamp()))
+
+    def test_reuse_within_minute(self, monkeypatch, cache_dir):
+        calls = self.setup_fetch(monkeypatch, DataFrame({"Open": [1.0, 2.0]}))
+        self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+        self.set_written(cache_dir, self.now - timedelta(seconds=15))
+        market_data = self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+
+        assert len(calls) == 1
+        assert list(market_data["Open"]) == [1.0, 2.0]
+
+    def test_miss_after_minute(self, monkeypatch, cache_dir):
+        calls = self.setup_fetch(monkeypatch, DataFrame({"Open": [1.0, 2.0]}))
+        self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+        self.set_written(cache_dir, self.now - timedelta(seconds=60))
+        self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+
+        assert len(calls) == 2
+
+    def test_empty_not_cached(self, monkeypatch, cache_dir):
+        calls = self.setup_fetch(monkeypatch, DataFrame())
+        self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+        self.my_portfolio.download_market_data(BlankArgs(), ["AAPL"])
+
+        assert list(cache_dir.iterdir()) == []
+        assert len(calls) == 2
+
+
+class TestRenderBraille:
+
+    red = (255, 0, 0)
+
+    def test_dots(self):
+        # four points climbing across two characters
+        rows = portfolio.render_braille([[0, 1, 2, 3]], [self.red], 2, 1, 0, 3, 4)
+        assert rows == ["\x1b[38;2;255;0;0m" + chr(0x2860) + chr(0x280A) + "\x1b[0m"]
+
+    def test_empty_cells(self):
+        rows = portfolio.render_braille([[1, 1]], [self.red], 4, 2, 0, 1, 8)
+        assert rows[1] == "    "
+
+    def test_flat_series(self):
+        # a flat series sits on the lowest dot row of the bottom character row
+        rows = portfolio.render_braille([[5, 5, 5]], [self.red], 3, 2, 5, 5)
+        assert rows == ["   ", "\x1b[38;2;255;0;0m" + chr(0x2840) * 3 + "\x1b[0m"]
+
+    def test_fast_render_graph(self):
+        nan = float("NaN")
+        stocks = [
+            portfolio.Stock("AAA", [1, 2, 3, 4]),
+            portfolio.Stock("BBB", [2, nan, 3]),
+        ]
+        graph = portfolio.Graph(
+            stocks,
+            20,
+            4,
+            [None, "lime"],
+            starttime=datetime(2021, 3, 1, 9, 30),
+            endtime=datetime(2021, 3, 1, 16, 0),
+            fast_render=True,
+        )
+        graph.gen_graph(portfolio._AUTO_COLORS_RGB)
+        lines = graph().split("\n")
+
+        # value axis labels, one per row from the top
+        assert [line[:15] for line in lines[:4]] == [
+            "        4.00 | ",
+            "        3.25 | ",
+            "        2.50 | ",
+            "        1.75 | ",
+        ]
+        assert any(0x2800 < ord(char) <= 0x28FF for char in "".join(lines[:4]))
+        # time axis
+        assert lines[4] == " " * 13 + "+" + "-" * 21
+        assert lines[5] == " " * 15 + "09:30" + "16:00".rjust(15)
+        # legend
+        assert lines[6:] == [
+            "",
+            " " * 15 + "\x1b[38;2;255;0;0m\u28e4\u28e4 \x1b[0mAAA",
+            " " * 15 + "\x1b[38;2;0;255;0m\u28e4\u28e4 \x1b[0mBBB",
+        ]
@@ -0,0 +1,76 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import renderer
+import portfolio
+
+
+class TestFormatNumber:
+    def test_two_decimals(self):
+        assert renderer.format_number(12.5) == "12.50"
+        assert renderer.format_number(2 / 3) == "0.67"
+
+    def test_absolute_value(self):
+        assert renderer.format_number(-4.25) == "4.25"
+
+    def test_nan(self):
+        assert renderer.format_number(float("nan")) == "0.00"
+
+    def test_down_mode(self):
+        assert renderer.format_number(2 / 3, "down") == "0.66"
+        assert renderer.format_number(-2 / 3, "down") == "0.66"
+        assert renderer.format_number(12.5, "down") == "12.50"
+
+    def test_format_gl(self):
+        assert renderer.format_gl(1.5) == "+$1.50"
+        assert renderer.format_gl(-1.5, False) == "-1.50"
+
+
+class TestFormatShares:
+    def test_whole_count(self):
+        assert renderer.format_shares(3.0) == "3.0"
+
+    def test_fractional_count(self):
+        assert renderer.format_shares(2.125) == "2.12"
+
+
+class TestRenderer:
+    @pytest.fixture
+    def my_renderer(self):
+        my_portfolio = portfolio.Portfolio()
+        my_stock = portfolio.Stock("TEST", [2, 1, 3, 5, 4])
+        my_portfolio.add_entry(my_stock, 3.0, 2.5, "blue", False)
+
+        # the renderer is a singleton, so set its state on whichever instance exists
+        my_renderer = renderer.Renderer("math", my_portfolio)
+        my_renderer.mode = "math"
+        my_renderer.portfolio = my_portfolio
+        return my_renderer
+
+    def test_print_gains(self, my_renderer):
+        out = []
+        my_renderer.print_gains(out, "{:13}", 6, "Today")
+        line = "".join(out)
+        assert "Value Gained Today:" in line
+        assert "+$6.00" in line
+        assert "+80.00%" in line
+
+    def test_print_gains_loss_down_mode(self, my_renderer):
+        my_renderer.mode = "down"
+        out = []
+        my_renderer.print_gains(out, "{:13}", -2 / 3, "Overall")
+        line = "".join(out)
+        assert "Value Lost Overall:" in line
+        assert "-$0.66" in line
+        assert "-8.88%" in line
+
+    def test_print_new_table(self, my_renderer):
+        out = []
+        my_renderer.print_new_table(out)
+        table = "".join(out)
+        for cell in ["TEST", "4.00", "+$2.00", "+50.00%", "3.0 ", "7.50", "12.00"]:
+            assert cell in table
+        assert "+$4.50" in table
+        assert "+60.00%" in table
@@ -3,7 +3,7 @@ import sys
 import pytest
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import round_value, Singleton
+from utils import round_value, fill_nan, Singleton
 
 
 class mysingleton(metaclass=Singleton):
@@ -52,3 +52,22 @@ class TestRoundValue:
 
     def test_zero_decimals_down(self):
         assert round_value(1.456543, "down", 0) == 1
+
+
+class TestFillNan:
+    nan = float("NaN")
+
+    def test_no_nan(self):
+        assert list(fill_nan([1, 2, 3])) == [1, 2, 3]
+
+    def test_forward_fill(self):
+        assert list(fill_nan([1, self.nan, self.nan, 4, self.nan])) == [1, 1, 1, 4, 4]
+
+    def test_leading_nan(self):
+        assert list(fill_nan([self.nan, self.nan, 3, self.nan, 5])) == [3, 3, 3, 3, 5]
+
+    def test_all_nan(self):
+        assert all(value != value for value in fill_nan([self.nan, self.nan]))
+
+    def test_empty(self):
+        assert len(fill_nan([])) == 0
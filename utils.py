@@ -1,3 +1,5 @@
+import numpy as np
+
 from math import trunc, isnan
 
 
@@ -30,3 +32,21 @@ def round_value(value, mode, decimal_places):
 
         factor = 10.0 ** decimal_places
         return trunc(value * factor) / factor
+
+
+# Replaces each NaN with the closest valid value before it, leading NaNs take the first valid value
+def fill_nan(values):
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    # nothing to fill, or nothing to fill it with
+    if valid.all() or not valid.any():
+        return values
+
+    # index of the last valid value at or before every position
+    index = np.where(valid, np.arange(values.size), 0)
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+
+    first = np.argmax(valid)
+    filled[:first] = filled[first]
+    return filled